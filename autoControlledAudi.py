@@ -15,7 +15,10 @@ except ImportError:
 
 from pybricks.pupdevices import Motor, Remote
 from pybricks.parameters import Button, Color, Direction, Port, Stop
-from pybricks.tools import StopWatch, wait
+from pybricks.tools import StopWatch
+
+from latency_probe import LatencyProbe
+from loop_logger import LoopLogger
 
 hub = TechnicHub()
 
@@ -88,6 +91,11 @@ FORWARD_TURN_MS = 800    # durée de braquage en avançant pour finir l'éviteme
 STALL_SPEED_THRESHOLD = 150     # vitesse réelle moyenne sous laquelle on considère un blocage
 STALL_COMMAND_THRESHOLD = 400   # commande minimale pour considérer une avance réelle
 STALL_TIME_MS = 400             # durée du blocage avant de déclencher l'évitement
+LOOP_WAIT_MS = 50               # pause entre deux tours de boucle (sert aussi à vider le journal)
+LATENCY_BUILD = "dev"           # étiquette du rapport de latence pour comparer les versions
+
+log = LoopLogger()
+latency = LatencyProbe("auto", drive_left, build=LATENCY_BUILD, triggered=True)
 
 
 def shutdown_system():
@@ -102,6 +110,8 @@ def shutdown_system():
     except AttributeError:
         if hasattr(remote, "power"):
             remote.power.off()
+    log.flush_all()
+    latency.report()
     hub.system.shutdown()
 
 
@@ -137,13 +147,14 @@ state = "forward"
 state_watch = StopWatch()
 stall_watch = StopWatch()
 stall_timer_active = False
+report_held = False
 
 
 def enter_state(new_state):
     global state
     state = new_state
     state_watch.reset()
-    print(f"--> Etat {state}")
+    log.info("--> Etat {}", state)
 
 
 def motor_stall_detected(command_speed):
@@ -179,10 +190,19 @@ while True:
     if Button.LEFT in buttons and Button.RIGHT in buttons:
         shutdown_system()
 
+    # Bouton central vert : affiche le rapport de latence (une fois par appui).
+    if Button.CENTER in buttons:
+        if not report_held:
+            latency.report(log)
+        report_held = True
+    else:
+        report_held = False
+
     try:
         distance_mm = distance_sensor.distance()
     except (OSError, ValueError):
         distance_mm = None
+    latency.mark_input()
 
     if state == "forward":
         speed = FORWARD_SIGN * MAX_SPEED
@@ -193,10 +213,11 @@ while True:
         )
         obstacle_by_stall = motor_stall_detected(speed)
         if obstacle_by_distance:
-            print(f"Obstacle détecté à {distance_mm} mm.")
+            log.info("Obstacle détecté à {} mm.", distance_mm)
         elif obstacle_by_stall:
-            print("Obstacle détecté par effort moteur.")
+            log.info("Obstacle détecté par effort moteur.")
         if obstacle_by_distance or obstacle_by_stall:
+            latency.mark_trigger()
             enter_state("reverse_turn")
 
     elif state == "reverse_turn":
@@ -215,14 +236,17 @@ while True:
         )
         obstacle_by_stall = motor_stall_detected(speed)
         if obstacle_by_distance or obstacle_by_stall:
-            print("Obstacle toujours présent pendant l'évitement.")
+            log.info("Obstacle toujours présent pendant l'évitement.")
+            latency.mark_trigger()
             enter_state("reverse_turn")
         elif state_watch.time() >= FORWARD_TURN_MS:
             enter_state("forward")
             angle = 0
 
+    latency.mark_decision()
     steer.run_target(STEER_SPEED, angle, Stop.HOLD, wait=False)
     drive_left.run(speed)
     drive_right.run(speed)
+    latency.mark_command(speed)
 
-    wait(50)
+    log.tick(LOOP_WAIT_MS, latency.poll)
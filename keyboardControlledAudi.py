@@ -1,7 +1,7 @@
 from pybricks.hubs import TechnicHub
 from pybricks.pupdevices import Motor
 from pybricks.parameters import Color, Direction, Port, Stop
-from pybricks.tools import StopWatch, wait
+from pybricks.tools import StopWatch
 
 try:
     import sys
@@ -13,6 +13,9 @@ try:
 except ImportError:
     select = None
 
+from latency_probe import LatencyProbe
+from loop_logger import LoopLogger
+
 
 hub = TechnicHub()
 
@@ -54,6 +57,8 @@ STEER_STEP = 5               # incrément par tick clavier gauche/droite
 STEER_MARGIN = 2             # marge pour éviter la contrainte sur les butées
 STEER_SPEED = 800            # vitesse de braquage en deg/s
 KEY_HOLD_TIMEOUT_MS = 160    # délai sans répétition avant de considérer la touche relâchée
+LOOP_WAIT_MS = 50            # pause entre deux tours de boucle (sert aussi à vider le journal)
+LATENCY_BUILD = "dev"        # étiquette du rapport de latence pour comparer les versions
 
 
 class KeyboardController:
@@ -66,6 +71,7 @@ class KeyboardController:
         "D": "ARROW_LEFT",
     }
     RESERVED_KEYS = {"q", "Q"}   # utilisé pour quitter pendant la conduite
+    REPORT_KEYS = {"l", "L"}     # affiche le rapport de latence pendant la conduite
 
     def __init__(self, timeout_ms):
         if select is None:
@@ -82,6 +88,7 @@ class KeyboardController:
         self.key_states = {}
         self.key_deadlines = {}
         self.quit_requested = False
+        self.report_requested = False
         self._buffer = ""
 
         self._stream = sys.stdin
@@ -140,6 +147,9 @@ class KeyboardController:
             if key_id in self.RESERVED_KEYS:
                 print("Cette touche est réservée pour quitter. Choisis-en une autre.")
                 continue
+            if key_id in self.REPORT_KEYS:
+                print("Cette touche est réservée au rapport de latence. Choisis-en une autre.")
+                continue
             if key_id in already_chosen.values():
                 print("Touche déjà affectée, choisis-en une autre.")
                 continue
@@ -200,6 +210,9 @@ class KeyboardController:
         if not capture_mode and char in self.RESERVED_KEYS:
             self.quit_requested = True
             return None
+        if not capture_mode and char in self.REPORT_KEYS:
+            self.report_requested = True
+            return None
 
         self._buffer += char
         if self._buffer in ("\x1b", "\x1b["):
@@ -229,6 +242,8 @@ def shutdown_system():
     drive_right.stop()
     steer.stop()
     hub.light.on(Color.RED)
+    log.flush_all()
+    latency.report()
     hub.system.shutdown()
 
 
@@ -276,6 +291,9 @@ DEFAULT_BINDINGS = {
 keyboard = KeyboardController(KEY_HOLD_TIMEOUT_MS)
 keyboard.configure_bindings(ACTIONS, DEFAULT_BINDINGS)
 
+log = LoopLogger()
+latency = LatencyProbe("keyboard", drive_left, build=LATENCY_BUILD)
+
 speed = 0
 angle = 0
 
@@ -284,6 +302,10 @@ try:
         keys = keyboard.update()
         if keyboard.quit_requested:
             break
+        if keyboard.report_requested:
+            keyboard.report_requested = False
+            latency.report(log)
+        latency.mark_input()
 
         if keys["forward"]:
             speed = MAX_SPEED
@@ -299,12 +321,14 @@ try:
         else:
             angle = 0
 
+        latency.mark_decision()
         steer.run_target(STEER_SPEED, angle, Stop.HOLD, wait=False)
         drive_left.run(speed)
         drive_right.run(speed)
+        latency.mark_command(speed)
 
         hub.light.on(Color.GREEN if speed >= 0 else Color.RED)
-        wait(50)
+        log.tick(LOOP_WAIT_MS, latency.poll)
 except KeyboardInterrupt:
     print("Interruption clavier.")
 finally:
@@ -0,0 +1,170 @@
+from pybricks.tools import StopWatch
+
+# Bornes supérieures des classes d'histogramme en ms (la dernière classe est "au-delà").
+BUCKET_EDGES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+PERCENTILES = (50, 90, 99)
+
+SEGMENTS = (
+    "entrée->décision",
+    "décision->commande",
+    "commande->réponse",
+    "entrée->réponse",
+)
+
+
+class LatencyHistogram:
+    """Histogramme à classes fixes : taille constante, aucune allocation par mesure."""
+
+    def __init__(self, edges=BUCKET_EDGES_MS):
+        self.edges = edges
+        self.counts = [0] * (len(edges) + 1)
+        self.total = 0
+        self.max_ms = 0
+
+    def add(self, value_ms):
+        index = 0
+        for edge in self.edges:
+            if value_ms <= edge:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.total += 1
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def percentile(self, pct):
+        """Retourne la borne de la classe contenant le percentile (None si vide)."""
+        if not self.total:
+            return None
+        rank = (self.total * pct + 99) // 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.edges[index] if index < len(self.edges) else None
+        return None
+
+    def describe(self):
+        if not self.total:
+            return "aucune mesure"
+        parts = []
+        for pct in PERCENTILES:
+            bound = self.percentile(pct)
+            label = f"<={bound}" if bound is not None else f">{self.edges[-1]}"
+            parts.append(f"p{pct}{label}")
+        return f"n={self.total} {' '.join(parts)} max={self.max_ms} ms"
+
+
+class LatencyProbe:
+    """Mesure le délai entre une entrée et la réponse réelle d'un moteur de propulsion.
+
+    A chaque tour de boucle, le script appelle `mark_input()` après lecture de
+    l'entrée, `mark_decision()` une fois la consigne calculée puis
+    `mark_command(speed)` après `motor.run(speed)`. Seuls les tours où la
+    consigne change ouvrent une mesure ; elle se ferme quand la vitesse
+    mesurée du moteur a bougé d'au moins `response_delta` dans le sens
+    demandé. La réponse est guettée par `poll()`, à passer à
+    `LoopLogger.tick()` pour l'appeler toutes les quelques ms de l'attente.
+
+    Avec `triggered=True` (automate à états), seuls les changements précédés
+    de `mark_trigger()` sont mesurés, depuis l'échantillon qui les a
+    déclenchés même si la consigne ne change qu'au tour suivant ; les
+    changements dus aux minuteries sont seulement comptés.
+    """
+
+    def __init__(self, name, motor, build="dev", response_delta=100, timeout_ms=1000,
+                 triggered=False):
+        self.name = name
+        self.motor = motor
+        self.build = build
+        self.response_delta = response_delta   # variation de vitesse (deg/s) considérée comme une réponse
+        self.timeout_ms = timeout_ms
+        self.triggered = triggered
+        self.histograms = {segment: LatencyHistogram() for segment in SEGMENTS}
+        self.abandoned = 0   # mesure remplacée par une nouvelle consigne avant réponse
+        self.timeouts = 0
+        self.untriggered = 0   # changements de consigne sans entrée déclenchante (minuteries)
+
+        self.clock = StopWatch()
+        self._last_command = None
+        self._input_at = 0
+        self._decision_at = 0
+        self._trigger = None   # (entrée, décision) de l'échantillon déclencheur en attente
+        self._pending = None   # (entrée, commande, vitesse initiale, sens attendu)
+
+    def mark_input(self):
+        self._input_at = self.clock.time()
+        self._poll_response(self._input_at)
+
+    def mark_decision(self):
+        self._decision_at = self.clock.time()
+
+    def mark_trigger(self):
+        """Signale que l'entrée de ce tour déclenche un changement de consigne."""
+        if self._trigger is None:
+            self._trigger = (self._input_at, self.clock.time())
+
+    def poll(self):
+        self._poll_response(self.clock.time())
+
+    def mark_command(self, speed):
+        now = self.clock.time()
+        if speed == self._last_command:
+            self._poll_response(now)
+            return
+
+        previous = self._last_command
+        self._last_command = speed
+        trigger = self._trigger
+        self._trigger = None
+        if previous is None:
+            return
+        if self._pending is not None:
+            self.abandoned += 1
+            self._pending = None
+
+        if trigger is not None:
+            input_at, decision_at = trigger
+        elif self.triggered:
+            self.untriggered += 1
+            return
+        else:
+            input_at, decision_at = self._input_at, self._decision_at
+
+        self.histograms["entrée->décision"].add(decision_at - input_at)
+        self.histograms["décision->commande"].add(now - decision_at)
+        direction = 1 if speed > previous else -1
+        self._pending = (input_at, now, self.motor.speed(), direction)
+
+    def _poll_response(self, now):
+        if self._pending is None:
+            return
+        input_at, command_at, start_speed, direction = self._pending
+        if now - command_at > self.timeout_ms:
+            self.timeouts += 1
+            self._pending = None
+            return
+        if (self.motor.speed() - start_speed) * direction >= self.response_delta:
+            self.histograms["commande->réponse"].add(now - command_at)
+            self.histograms["entrée->réponse"].add(now - input_at)
+            self._pending = None
+
+    def report(self, log=None):
+        """Affiche les percentiles, ou les met en file dans `log` pendant la conduite.
+
+        A appeler avant `mark_input()` : la mesure en cours est abandonnée
+        (sans être comptée) pour que le temps d'affichage ne fausse pas les
+        histogrammes.
+        """
+        self._pending = None
+        self._trigger = None
+        write = log.info if log is not None else print
+        header = (
+            f"[latence] {self.name} build={self.build} "
+            f"abandons={self.abandoned} sans_réponse={self.timeouts}"
+        )
+        if self.triggered:
+            header = f"{header} minuterie={self.untriggered}"
+        write(header)
+        for segment in SEGMENTS:
+            write(f"  {segment:<20} {self.histograms[segment].describe()}")
@@ -0,0 +1,144 @@
+from pybricks.tools import StopWatch, wait
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DBG", INFO: "INF", WARNING: "AVT", ERROR: "ERR"}
+
+
+class LoopLogger:
+    """Journal à tampon fixe qui n'écrit sur stdout que sur le temps libre de la boucle.
+
+    Les messages sont stockés sans mise en forme (modèle + arguments) et ne
+    sont formatés qu'au moment de l'écriture. Un message identique (même
+    modèle, mêmes arguments) qui suit le précédent à moins de `repeat_ms` est
+    compté au lieu d'être réécrit ; une ligne de compte est écrite dès
+    qu'un autre message arrive ou que la fenêtre expire, puis le comptage
+    continue sur une nouvelle fenêtre. Un tampon plein perd la nouvelle ligne
+    (compteur `dropped`) plutôt que de bloquer la boucle ; l'avis de perte
+    est écrit après les lignes plus anciennes encore en file.
+    """
+
+    def __init__(self, capacity=16, level=INFO, repeat_ms=1000, flush_margin_ms=20, poll_ms=5):
+        self.capacity = capacity
+        self.level = level
+        self.repeat_ms = repeat_ms
+        self.flush_margin_ms = flush_margin_ms   # temps minimal restant pour tenter un print
+        self.poll_ms = poll_ms                   # tranche d'attente entre deux appels de `poll`
+        self.dropped = 0
+
+        self.clock = StopWatch()
+        self._tick_watch = StopWatch()
+        self._lines = [None] * capacity
+        self._head = 0
+        self._count = 0
+        self._last = None        # (niveau, modèle, arguments) du dernier message en file
+        self._last_at = 0
+        self._repeats = 0
+        self._reported_dropped = 0
+        self._drop_mark = 0      # lignes à écrire avant l'avis de perte en attente
+
+    def debug(self, template, *args):
+        self.log(DEBUG, template, *args)
+
+    def info(self, template, *args):
+        self.log(INFO, template, *args)
+
+    def warning(self, template, *args):
+        self.log(WARNING, template, *args)
+
+    def error(self, template, *args):
+        self.log(ERROR, template, *args)
+
+    def log(self, level, template, *args):
+        """Met un message en file sans jamais écrire sur stdout."""
+        if level < self.level:
+            return
+
+        now = self.clock.time()
+        message = (level, template, args)
+        if message == self._last:
+            if now - self._last_at < self.repeat_ms:
+                self._repeats += 1
+                return
+            if self._repeats:
+                # Fenêtre expirée : seul le compte est écrit, ce message ouvre la suivante.
+                self._close_repeats(now)
+                self._repeats = 1
+                return
+        else:
+            self._close_repeats(now)
+        self._last = message
+        self._last_at = now
+        self._enqueue(now, level, template, args, 0)
+
+    def tick(self, wait_ms, poll=None):
+        """Remplace `wait(wait_ms)` : vide le journal sur ce délai puis attend le reste.
+
+        `poll`, s'il est fourni, est appelé après chaque ligne écrite et toutes
+        les `poll_ms` pendant l'attente.
+        """
+        now = self.clock.time()
+        if now - self._last_at >= self.repeat_ms:
+            self._close_repeats(now)
+        self._tick_watch.reset()
+        while self._has_pending() and wait_ms - self._tick_watch.time() > self.flush_margin_ms:
+            self._write_one()
+            if poll is not None:
+                poll()
+        remaining = wait_ms - self._tick_watch.time()
+        while remaining > 0:
+            if poll is None:
+                wait(remaining)
+                return
+            wait(min(self.poll_ms, remaining))
+            poll()
+            remaining = wait_ms - self._tick_watch.time()
+
+    def flush_all(self):
+        """Écrit tout le tampon (à n'utiliser qu'hors de la boucle de contrôle)."""
+        self._close_repeats(self.clock.time())
+        while self._has_pending():
+            self._write_one()
+
+    def _close_repeats(self, now):
+        """Met en file le nombre de répétitions du dernier message, s'il y en a."""
+        if not self._repeats:
+            return
+        level, template, args = self._last
+        self._enqueue(now, level, template, args, self._repeats)
+        self._repeats = 0
+        self._last_at = now
+
+    def _enqueue(self, stamp, level, template, args, repeats):
+        if self._count >= self.capacity:
+            if self.dropped == self._reported_dropped:
+                self._drop_mark = self._count
+            self.dropped += 1
+            return
+        index = (self._head + self._count) % self.capacity
+        self._lines[index] = (stamp, level, template, args, repeats)
+        self._count += 1
+
+    def _has_pending(self):
+        return self._count > 0 or self.dropped > self._reported_dropped
+
+    def _write_one(self):
+        if self.dropped > self._reported_dropped and not self._drop_mark:
+            print(f"[log] {self.dropped - self._reported_dropped} ligne(s) perdue(s)")
+            self._reported_dropped = self.dropped
+            return
+
+        stamp, level, template, args, repeats = self._lines[self._head]
+        self._lines[self._head] = None
+        self._head = (self._head + 1) % self.capacity
+        self._count -= 1
+        if self._drop_mark:
+            self._drop_mark -= 1
+
+        text = template.format(*args) if args else template
+        if repeats:
+            text = f"{text} (+{repeats} répétition(s))"
+        print(f"{stamp:>7} {LEVEL_NAMES.get(level, level)} {text}")
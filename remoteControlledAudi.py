@@ -1,7 +1,9 @@
 from pybricks.hubs import TechnicHub
 from pybricks.pupdevices import Motor, Remote
 from pybricks.parameters import Port, Direction, Stop, Button, Color
-from pybricks.tools import wait
+
+from latency_probe import LatencyProbe
+from loop_logger import LoopLogger
 
 hub = TechnicHub()
 
@@ -44,6 +46,11 @@ MAX_SPEED = 1000         # vitesse max en deg/s
 STEER_STEP = 20           # incrément par appui court sur B+ ou B-
 STEER_MARGIN = 2         # marge pour éviter la contrainte sur les butées
 STEER_SPEED = 1200       # vitesse de braquage en deg/s (augmentée pour répondre plus vite)
+LOOP_WAIT_MS = 50        # pause entre deux tours de boucle (sert aussi à vider le journal)
+LATENCY_BUILD = "dev"    # étiquette du rapport de latence pour comparer les versions
+
+log = LoopLogger()
+latency = LatencyProbe("remote", drive_left, build=LATENCY_BUILD)
 
 
 def shutdown_system():
@@ -59,6 +66,8 @@ def shutdown_system():
         # Anciennes versions exposent power.off()
         if hasattr(remote, "power"):
             remote.power.off()
+    log.flush_all()
+    latency.report()
     hub.system.shutdown()
 
 
@@ -92,14 +101,24 @@ STEER_ANGLE = calibrate_steering()
 
 speed = 0
 angle = 0
+report_held = False
 
 while True:
     buttons = remote.buttons.pressed() or ()
 
     if Button.LEFT in buttons:
-        print("Shutdown!")
+        log.info("Shutdown!")
         shutdown_system()
 
+    # Bouton central vert : affiche le rapport de latence (une fois par appui).
+    if Button.CENTER in buttons:
+        if not report_held:
+            latency.report(log)
+        report_held = True
+    else:
+        report_held = False
+    latency.mark_input()
+
     # A+/A- contrôle direct de la propulsion : relâcher = stop.
     if Button.LEFT_PLUS in buttons:
         speed = MAX_SPEED
@@ -116,9 +135,11 @@ while True:
     elif Button.RIGHT in buttons:
         angle = 0
 
+    latency.mark_decision()
     steer.run_target(STEER_SPEED, angle, Stop.HOLD, wait=False)
     drive_left.run(speed)
     drive_right.run(speed)
+    latency.mark_command(speed)
 
     hub.light.on(Color.GREEN if speed >= 0 else Color.RED)
-    wait(50)
+    log.tick(LOOP_WAIT_MS, latency.poll)